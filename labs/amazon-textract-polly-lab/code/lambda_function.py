@@ -1,14 +1,23 @@
 import boto3
 import os
+from botocore.config import Config
 
 s3_bucket = os.environ['BUCKET_NAME']
 sample_file = 'textract_sample.jpeg'
 
+# Create clients once per container so warm invocations reuse them
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=3,
+    read_timeout=30,
+    max_pool_connections=20
+)
+textract_client = boto3.client('textract', config=client_config)
+polly_client = boto3.client('polly', config=client_config)
+
 def lambda_handler(event, context):
     
-    textract_client = boto3.client('textract')
-    text2speech = ''
-    
     textract_response = textract_client.detect_document_text(
      Document={
          'S3Object': {
@@ -17,15 +26,11 @@ def lambda_handler(event, context):
          }
      })
        
-    for item in textract_response["Blocks"]:
-        if item["BlockType"] == "LINE":
-             text2speech = text2speech+' '+item["Text"]
+    text2speech = ' '.join(item["Text"] for item in textract_response["Blocks"] if item["BlockType"] == "LINE")
     
     print(text2speech)
     
     # Request speech synthesis
-    polly_client = boto3.client('polly')
-
     response = polly_client.start_speech_synthesis_task(
         VoiceId='Amy',  
         OutputFormat='mp3', 
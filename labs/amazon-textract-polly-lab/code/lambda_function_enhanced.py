@@ -10,21 +10,49 @@ Purpose: Extract text from documents and convert to audio files
 Services: AWS Lambda, Amazon Textract, Amazon Polly, Amazon S3
 
 Workflow:
-1. Extract text from image documents using Amazon Textract
-2. Process and concatenate extracted text lines
-3. Convert text to speech using Amazon Polly's neural engine
-4. Store resulting audio file in S3 bucket
+1. Start an asynchronous Amazon Textract text detection job (lambda_handler)
+2. Receive the Textract completion notification via SNS (on_textract_complete)
+3. Process and concatenate extracted text lines
+4. Convert text to speech using Amazon Polly's neural engine
+5. Store resulting audio file in S3 bucket
+6. Receive the Polly completion notification via SNS (on_synthesis_complete)
 
 Environment Variables Required:
 - BUCKET_NAME: S3 bucket for input documents and output audio files
+- TEXTRACT_SNS_TOPIC_ARN: SNS topic Textract publishes job completion to
+- TEXTRACT_ROLE_ARN: IAM role Textract assumes to publish to the SNS topic
+
+Optional:
+- TEXT_CACHE_TABLE: DynamoDB table caching extracted text by S3 ETag
+- TEXT_CACHE_MAX_ENTRIES: In-process cache size for DynamoDB hits (default 32)
+- POLLY_SNS_TOPIC_ARN: SNS topic Polly notifies when synthesis finishes (on_synthesis_complete)
+- WARM_UP_CLIENTS: Comma-separated clients to warm up during INIT (textract, polly, s3, dynamodb)
 """
 
 import boto3
 import os
 import json
 import logging
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
+
+# orjson is a faster drop-in for JSON handling when packaged with the
+# deployment; fall back to the standard library otherwise
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
 
 # Configure logging
 logger = logging.getLogger()
@@ -36,11 +64,59 @@ SAMPLE_FILE = os.environ.get('SAMPLE_FILE', 'textract_sample.jpeg')
 VOICE_ID = os.environ.get('VOICE_ID', 'Amy')
 OUTPUT_FORMAT = os.environ.get('OUTPUT_FORMAT', 'mp3')
 ENGINE = os.environ.get('ENGINE', 'neural')
+POLLY_MAX_CHARS = 95000  # Stay under Polly's 100k billed-character task limit
+POLLY_MAX_WORKERS = 8
+TEXTRACT_SNS_TOPIC_ARN = os.environ.get('TEXTRACT_SNS_TOPIC_ARN')
+TEXTRACT_ROLE_ARN = os.environ.get('TEXTRACT_ROLE_ARN')
+POLLY_SNS_TOPIC_ARN = os.environ.get('POLLY_SNS_TOPIC_ARN')
+TEXT_CACHE_TABLE = os.environ.get('TEXT_CACHE_TABLE')
+TEXT_CACHE_TTL_SECONDS = int(os.environ.get('TEXT_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+TEXT_CACHE_MAX_ENTRIES = int(os.environ.get('TEXT_CACHE_MAX_ENTRIES', 32))
+WARM_UP_CLIENTS = {name.strip() for name in os.environ.get('WARM_UP_CLIENTS', '').split(',') if name.strip()}
+
+# Warm-container copy of DynamoDB cache hits keyed by S3 ETag, evicted
+# least-recently-used so memory stays bounded
+_TEXT_CACHE: 'OrderedDict[str, str]' = OrderedDict()
+
+# Shared client configuration: keep pooled connections alive between calls
+# so warm invocations skip the TCP/TLS handshake. In-region endpoints connect
+# in milliseconds, so a 1s connect timeout also keeps INIT warm-up short.
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=1,
+    read_timeout=30,
+    max_pool_connections=20
+)
+
+# Textract throttles bulk workloads aggressively; give its client more
+# adaptive retry headroom so bursts are shaped client-side
+TEXTRACT_CONFIG = CLIENT_CONFIG.merge(Config(retries={'mode': 'adaptive', 'max_attempts': 10}))
+LINE_TEXT = itemgetter('Text')  # Textract always populates Text on LINE blocks
+TEXTRACT_THROTTLING_ERRORS = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'LimitExceededException'
+)
+
+# Initialize AWS clients once per container so warm invocations reuse them.
+# Failures here surface during the Lambda INIT phase instead of mid-request.
+try:
+    TEXTRACT = boto3.client('textract', config=TEXTRACT_CONFIG)
+    POLLY = boto3.client('polly', config=CLIENT_CONFIG)
+    S3 = boto3.client('s3', config=CLIENT_CONFIG)
+    DYNAMODB = boto3.client('dynamodb', config=CLIENT_CONFIG) if TEXT_CACHE_TABLE else None
+except (BotoCoreError, ClientError) as e:
+    logger.error(f"Failed to initialize AWS clients: {e}")
+    raise
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
-    Main Lambda handler function for document text extraction and speech synthesis.
+    Main Lambda handler function that starts asynchronous text extraction.
+
+    The Textract job runs server-side; processing resumes in
+    on_textract_complete once Textract publishes the job result to SNS.
 
     Args:
         event: Lambda event data (can contain S3 event triggers)
@@ -50,6 +126,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Dict containing status code, message, and processing details
     """
 
+    request_id = getattr(context, 'aws_request_id', 'N/A')
+
     try:
         logger.info("Starting document processing workflow")
 
@@ -60,32 +138,150 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         logger.info(f"Processing document: {document_key}")
 
-        # Step 1: Extract text using Amazon Textract
-        extracted_text = extract_text_from_document(document_key)
+        # Skip Textract entirely when this exact object was already processed;
+        # without a cache table there is nothing to look up
+        etag = None
+        if DYNAMODB:
+            etag = get_document_etag(document_key)
+            cached_text = get_cached_text(etag)
+            if cached_text is not None:
+                logger.info(f"Using cached text for ETag {etag}")
+                return synthesize_document(cached_text, document_key, request_id)
+
+        # Step 1: Submit the document to Amazon Textract
+        job_id = start_text_extraction(document_key, job_tag=etag)
+
+        return create_response(202, "Text extraction started", {
+            "document": document_key,
+            "textract_job_id": job_id
+        }, request_id=request_id)
+
+    except Exception as e:
+        logger.error(f"Error in document processing: {str(e)}")
+        return create_response(500, f"Processing error: {str(e)}", request_id=request_id)
+
 
-        if not extracted_text:
-            logger.warning("No text extracted from document")
-            return create_response(400, "No text found in document")
+def on_textract_complete(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    SNS-triggered handler that resumes processing after a Textract job finishes.
+
+    Args:
+        event: SNS event carrying the Textract job completion message
+        context: Lambda context object with runtime information
 
-        logger.info(f"Extracted text length: {len(extracted_text)} characters")
+    Returns:
+        Dict containing status code, message, and processing details
+    """
+
+    request_id = getattr(context, 'aws_request_id', 'N/A')
+
+    # A malformed message will never succeed, so acknowledge it rather than
+    # letting the async invocation retry it
+    try:
+        message = json_loads(event['Records'][0]['Sns']['Message'])
+        job_id = message['JobId']
+        document_key = message['DocumentLocation']['S3ObjectName']
+        status = message['Status']
+    except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+        logger.error(f"Malformed Textract notification: {e}")
+        return create_response(400, f"Malformed Textract notification: {str(e)}", request_id=request_id)
+
+    logger.info(f"Textract job {job_id} finished with status {status}")
+
+    if status != 'SUCCEEDED':
+        return create_response(500, f"Textract job {job_id} did not succeed", {
+            "document": document_key,
+            "status": status
+        }, request_id=request_id)
+
+    # Any other failure is re-raised so Lambda's async retries and on-failure
+    # destination see it; a returned error response would count as success
+    try:
+        # Step 2: Collect text from the completed Textract job
+        extracted_text = extract_text_from_document(job_id)
 
-        # Step 2: Convert text to speech using Amazon Polly
-        synthesis_task_id = convert_text_to_speech(extracted_text, document_key)
+        # The job tag carries the source object's ETag
+        etag = message.get('JobTag')
+        if etag and extracted_text:
+            cache_extracted_text(etag, extracted_text)
 
-        if synthesis_task_id:
-            logger.info(f"Speech synthesis task started: {synthesis_task_id}")
-            return create_response(200, "Document processing completed successfully", {
-                "document": document_key,
-                "text_length": len(extracted_text),
-                "synthesis_task_id": synthesis_task_id,
-                "extracted_text_preview": extracted_text[:100] + "..." if len(extracted_text) > 100 else extracted_text
-            })
-        else:
-            return create_response(500, "Failed to start speech synthesis")
+        return synthesize_document(extracted_text, document_key, request_id)
 
     except Exception as e:
         logger.error(f"Error in document processing: {str(e)}")
-        return create_response(500, f"Processing error: {str(e)}")
+        raise
+
+
+def on_synthesis_complete(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    SNS-triggered handler that receives finished Polly synthesis tasks.
+
+    Args:
+        event: SNS event carrying the Polly task completion message
+        context: Lambda context object with runtime information
+
+    Returns:
+        Dict containing status code, message, and the audio location
+    """
+
+    request_id = getattr(context, 'aws_request_id', 'N/A')
+
+    try:
+        message = json_loads(event['Records'][0]['Sns']['Message'])
+        task_id = message['taskId']
+        task_status = message['taskStatus']
+
+        logger.info(f"Speech synthesis task {task_id} finished with status {task_status}")
+
+        if task_status != 'COMPLETED':
+            return create_response(500, f"Speech synthesis task {task_id} did not complete", {
+                "synthesis_task_id": task_id,
+                "status": task_status
+            }, request_id=request_id)
+
+        logger.info(f"Audio available at {message['outputUri']}")
+        return create_response(200, "Speech synthesis completed", {
+            "synthesis_task_id": task_id,
+            "output_uri": message['outputUri']
+        }, request_id=request_id)
+
+    except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+        logger.error(f"Malformed Polly notification: {e}")
+        return create_response(400, f"Malformed Polly notification: {str(e)}", request_id=request_id)
+
+
+def synthesize_document(extracted_text: str, document_key: str, request_id: str = 'N/A') -> Dict[str, Any]:
+    """
+    Convert extracted document text to speech and build the handler response.
+
+    Args:
+        extracted_text: Text extracted from the document
+        document_key: S3 object key of the source document
+        request_id: Lambda request ID echoed in the response
+
+    Returns:
+        Formatted response dictionary
+    """
+
+    if not extracted_text:
+        logger.warning("No text extracted from document")
+        return create_response(400, "No text found in document", request_id=request_id)
+
+    logger.info(f"Extracted text length: {len(extracted_text)} characters")
+
+    # Step 3: Convert text to speech using Amazon Polly
+    synthesis_task_ids = convert_text_to_speech(extracted_text, document_key)
+
+    if synthesis_task_ids:
+        logger.info(f"Speech synthesis tasks started: {synthesis_task_ids}")
+        return create_response(200, "Document processing completed successfully", {
+            "document": document_key,
+            "text_length": len(extracted_text),
+            "synthesis_task_ids": synthesis_task_ids,
+            "extracted_text_preview": extracted_text[:100] + "..." if len(extracted_text) > 100 else extracted_text
+        }, request_id=request_id)
+    else:
+        return create_response(500, "Failed to start speech synthesis", request_id=request_id)
 
 
 def extract_document_key(event: Dict[str, Any]) -> Optional[str]:
@@ -117,60 +313,212 @@ def extract_document_key(event: Dict[str, Any]) -> Optional[str]:
         return None
 
 
-def extract_text_from_document(document_key: str) -> str:
+def get_document_etag(document_key: str) -> str:
+    """
+    Look up the S3 ETag identifying the document's current content.
+
+    Args:
+        document_key: S3 object key for the document
+
+    Returns:
+        ETag without surrounding quotes
     """
-    Extract text from a document using Amazon Textract.
+
+    response = S3.head_object(Bucket=S3_BUCKET, Key=document_key)
+    return response['ETag'].strip('"')
+
+
+def get_cached_text(etag: str) -> Optional[str]:
+    """
+    Return previously extracted text for a document ETag, if any.
+
+    Checks the in-process cache first, then the DynamoDB cache table when
+    configured. Cache lookup failures are logged and treated as misses.
+
+    Args:
+        etag: S3 ETag of the document
+
+    Returns:
+        Cached text or None on a cache miss
+    """
+
+    if etag in _TEXT_CACHE:
+        _TEXT_CACHE.move_to_end(etag)
+        return _TEXT_CACHE[etag]
+
+    if not DYNAMODB:
+        return None
+
+    try:
+        response = DYNAMODB.get_item(
+            TableName=TEXT_CACHE_TABLE,
+            Key={'etag': {'S': etag}}
+        )
+    except ClientError as e:
+        logger.warning(f"Text cache lookup failed: {e}")
+        return None
+
+    item = response.get('Item')
+    if not item:
+        return None
+
+    text = item['text']['S']
+    _TEXT_CACHE[etag] = text
+    if len(_TEXT_CACHE) > TEXT_CACHE_MAX_ENTRIES:
+        _TEXT_CACHE.popitem(last=False)
+
+    return text
+
+
+def cache_extracted_text(etag: str, text: str) -> None:
+    """
+    Store extracted text for a document ETag in the DynamoDB cache table.
+
+    Only the submitting function reads the cache, so nothing is kept in
+    this container's in-process cache.
+
+    Args:
+        etag: S3 ETag of the document
+        text: Extracted text to cache
+    """
+
+    if not DYNAMODB:
+        return
+
+    try:
+        DYNAMODB.put_item(
+            TableName=TEXT_CACHE_TABLE,
+            Item={
+                'etag': {'S': etag},
+                'text': {'S': text},
+                'expires_at': {'N': str(int(time.time()) + TEXT_CACHE_TTL_SECONDS)}
+            }
+        )
+    except ClientError as e:
+        # Oversized items (>400KB) and transient errors only cost a cache miss
+        logger.warning(f"Failed to cache extracted text: {e}")
+
+
+def _log_textract_client_error(e: ClientError) -> None:
+    """
+    Log a Textract ClientError, reporting throttles with the retry count.
+
+    Args:
+        e: Error raised by the Textract client
+    """
+
+    error_code = e.response['Error']['Code']
+    if error_code in TEXTRACT_THROTTLING_ERRORS:
+        retry_attempts = e.response.get('ResponseMetadata', {}).get('RetryAttempts')
+        logger.warning(f"Textract throttled [{error_code}] after {retry_attempts} retries: {e}")
+    else:
+        logger.error(f"Textract API error [{error_code}]: {e}")
+
+
+def start_text_extraction(document_key: str, job_tag: Optional[str] = None) -> str:
+    """
+    Start an asynchronous Amazon Textract text detection job.
 
     Args:
         document_key: S3 object key for the document to process
+        job_tag: Optional tag echoed back in the completion notification
 
     Returns:
-        Concatenated text from all detected text lines
+        Textract job ID
 
     Raises:
         ClientError: If Textract API call fails
-        ValueError: If document format is not supported
     """
 
     try:
-        # Initialize Textract client
-        textract_client = boto3.client('textract')
-
         logger.info(f"Starting text extraction for document: {document_key}")
 
-        # Perform document text detection
-        response = textract_client.detect_document_text(
-            Document={
+        request = {
+            'DocumentLocation': {
                 'S3Object': {
                     'Bucket': S3_BUCKET,
                     'Name': document_key
                 }
+            },
+            'NotificationChannel': {
+                'SNSTopicArn': TEXTRACT_SNS_TOPIC_ARN,
+                'RoleArn': TEXTRACT_ROLE_ARN
             }
-        )
+        }
 
-        # Process response and extract text
-        extracted_lines = []
-        block_count = len(response.get("Blocks", []))
+        if job_tag:
+            request['JobTag'] = job_tag
 
-        logger.info(f"Processing {block_count} blocks from Textract response")
+        response = TEXTRACT.start_document_text_detection(**request)
 
-        for block in response["Blocks"]:
-            if block["BlockType"] == "LINE":
-                text_content = block.get("Text", "").strip()
-                if text_content:
-                    extracted_lines.append(text_content)
+        job_id = response['JobId']
+        logger.info(f"Textract job submitted: {job_id}")
 
-        # Combine all text lines
-        full_text = ' '.join(extracted_lines)
+        return job_id
 
-        logger.info(f"Successfully extracted {len(extracted_lines)} text lines")
+    except ClientError as e:
+        _log_textract_client_error(e)
+        raise
+
+    except Exception as e:
+        logger.error(f"Unexpected error starting text extraction: {e}")
+        raise
+
+
+def iter_text_detection_pages(job_id: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield each page of results from a completed Textract text detection job.
+
+    Args:
+        job_id: ID of a finished Textract text detection job
+
+    Yields:
+        Raw get_document_text_detection responses, following NextToken
+    """
+
+    request = {'JobId': job_id}
+
+    while True:
+        response = TEXTRACT.get_document_text_detection(**request)
+        yield response
+
+        if 'NextToken' not in response:
+            return
+        request['NextToken'] = response['NextToken']
+
+
+def extract_text_from_document(job_id: str) -> str:
+    """
+    Collect the text detected by a completed Amazon Textract job.
+
+    Args:
+        job_id: ID of a finished Textract text detection job
+
+    Returns:
+        Concatenated text from all detected text lines
+
+    Raises:
+        ClientError: If Textract API call fails
+    """
+
+    try:
+        # WORD blocks dominate the result set, so reject non-LINE blocks with
+        # a single lookup and read LINE text via a C-level itemgetter
+        line_blocks = (
+            block
+            for page in iter_text_detection_pages(job_id)
+            for block in page.get("Blocks", ())
+            if block["BlockType"] == "LINE"
+        )
+        full_text = ' '.join(map(LINE_TEXT, line_blocks))
+
+        logger.info(f"Successfully extracted {len(full_text)} characters from Textract job {job_id}")
         logger.info(f"Text preview: {full_text[:200]}...")
 
         return full_text
 
     except ClientError as e:
-        error_code = e.response['Error']['Code']
-        logger.error(f"Textract API error [{error_code}]: {e}")
+        _log_textract_client_error(e)
         raise
 
     except Exception as e:
@@ -178,58 +526,92 @@ def extract_text_from_document(document_key: str) -> str:
         raise
 
 
-def convert_text_to_speech(text: str, source_document: str) -> Optional[str]:
+def chunk_text(text: str, max_chars: int = POLLY_MAX_CHARS) -> List[str]:
+    """
+    Split text into chunks no longer than max_chars, breaking on whitespace.
+
+    Args:
+        text: Text content to split
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        List of text chunks in original order
+    """
+
+    chunks = []
+
+    while len(text) > max_chars:
+        # Break on the last space before the limit so words stay intact
+        split_at = text.rfind(' ', 0, max_chars)
+        if split_at <= 0:
+            split_at = max_chars
+
+        chunks.append(text[:split_at])
+        text = text[split_at:].lstrip()
+
+    if text:
+        chunks.append(text)
+
+    return chunks
+
+
+def convert_text_to_speech(text: str, source_document: str) -> List[str]:
     """
     Convert extracted text to speech using Amazon Polly.
 
+    Text longer than a single Polly task allows is split into chunks that
+    are submitted concurrently as separate synthesis tasks.
+
     Args:
         text: Text content to convert to speech
         source_document: Original document name for output file naming
 
     Returns:
-        Synthesis task ID if successful, None otherwise
+        Synthesis task IDs in chunk order, empty if there was no text
 
     Raises:
         ClientError: If Polly API call fails
     """
 
     try:
-        # Initialize Polly client
-        polly_client = boto3.client('polly')
-
         # Validate text content
         if not text or len(text.strip()) == 0:
             logger.warning("Empty text provided for speech synthesis")
-            return None
+            return []
 
-        # Truncate text if too long (Polly has character limits)
-        max_chars = 100000  # Polly limit for neural voices
-        if len(text) > max_chars:
-            text = text[:max_chars]
-            logger.warning(f"Text truncated to {max_chars} characters for Polly processing")
+        chunks = chunk_text(text)
 
         # Generate output filename based on source document
         output_prefix = f"audio/{source_document.split('.')[0]}"
 
-        logger.info(f"Starting speech synthesis with voice: {VOICE_ID}")
+        logger.info(f"Starting {len(chunks)} speech synthesis task(s) with voice: {VOICE_ID}")
         logger.info(f"Output location: s3://{S3_BUCKET}/{output_prefix}")
 
-        # Start speech synthesis task
-        response = polly_client.start_speech_synthesis_task(
-            VoiceId=VOICE_ID,
-            OutputFormat=OUTPUT_FORMAT,
-            OutputS3BucketName=S3_BUCKET,
-            OutputS3KeyPrefix=output_prefix,
-            Text=text,
-            Engine=ENGINE,
-            LanguageCode='en-US',  # Explicitly set language
-            TextType='text'        # Specify text type
-        )
+        # Let Polly announce completion over SNS instead of being polled
+        notification = {'SnsTopicArn': POLLY_SNS_TOPIC_ARN} if POLLY_SNS_TOPIC_ARN else {}
+
+        def start_task(indexed_chunk) -> str:
+            index, chunk = indexed_chunk
+            response = POLLY.start_speech_synthesis_task(
+                VoiceId=VOICE_ID,
+                OutputFormat=OUTPUT_FORMAT,
+                OutputS3BucketName=S3_BUCKET,
+                OutputS3KeyPrefix=f"{output_prefix}/part{index:04d}",
+                Text=chunk,
+                Engine=ENGINE,
+                LanguageCode='en-US',  # Explicitly set language
+                TextType='text',       # Specify text type
+                **notification
+            )
+            return response['SynthesisTask']['TaskId']
 
-        task_id = response['SynthesisTask']['TaskId']
-        logger.info(f"Speech synthesis task created successfully: {task_id}")
+        # Polly renders tasks server-side in parallel, so submit them together
+        with ThreadPoolExecutor(max_workers=min(POLLY_MAX_WORKERS, len(chunks))) as executor:
+            task_ids = list(executor.map(start_task, enumerate(chunks)))
 
-        return task_id
+        logger.info(f"Speech synthesis tasks created successfully: {task_ids}")
+
+        return task_ids
 
     except ClientError as e:
         error_code = e.response['Error']['Code']
@@ -241,7 +623,12 @@ def convert_text_to_speech(text: str, source_document: str) -> Optional[str]:
         raise
 
 
-def create_response(status_code: int, message: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+def create_response(
+    status_code: int,
+    message: str,
+    data: Optional[Dict] = None,
+    request_id: str = 'N/A'
+) -> Dict[str, Any]:
     """
     Create standardized Lambda response.
 
@@ -249,6 +636,7 @@ def create_response(status_code: int, message: str, data: Optional[Dict] = None)
         status_code: HTTP status code
         message: Response message
         data: Optional additional data
+        request_id: Lambda request ID of the invocation
 
     Returns:
         Formatted response dictionary
@@ -260,9 +648,9 @@ def create_response(status_code: int, message: str, data: Optional[Dict] = None)
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_dumps({
             'message': message,
-            'timestamp': context.aws_request_id if 'context' in globals() else 'N/A',
+            'request_id': request_id,
             'data': data or {}
         })
     }
@@ -284,8 +672,7 @@ def get_synthesis_task_status(task_id: str) -> Dict[str, Any]:
     """
 
     try:
-        polly_client = boto3.client('polly')
-        response = polly_client.get_speech_synthesis_task(TaskId=task_id)
+        response = POLLY.get_speech_synthesis_task(TaskId=task_id)
         return response['SynthesisTask']
 
     except ClientError as e:
@@ -305,21 +692,51 @@ def validate_environment() -> bool:
         logger.error("BUCKET_NAME environment variable not set")
         return False
 
+    if not TEXTRACT_SNS_TOPIC_ARN or not TEXTRACT_ROLE_ARN:
+        logger.error("TEXTRACT_SNS_TOPIC_ARN and TEXTRACT_ROLE_ARN environment variables must be set")
+        return False
+
     try:
         # Test S3 access
-        s3_client = boto3.client('s3')
-        s3_client.head_bucket(Bucket=S3_BUCKET)
-
-        # Test Textract access
-        textract_client = boto3.client('textract')
+        S3.head_bucket(Bucket=S3_BUCKET)
 
         # Test Polly access
-        polly_client = boto3.client('polly')
-        polly_client.describe_voices(MaxItems=1)
+        POLLY.describe_voices(MaxItems=1)
 
         logger.info("Environment validation successful")
         return True
 
     except Exception as e:
         logger.error(f"Environment validation failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def warm_up_clients() -> None:
+    """
+    Issue one cheap call per client listed in WARM_UP_CLIENTS so DNS,
+    credentials and TLS are set up during the Lambda INIT phase rather than
+    on the first invocation.
+
+    Only the clients a function actually uses should be listed. Any response,
+    including an error, leaves a pooled connection behind, so failures are
+    ignored.
+    """
+
+    warm_up_calls = {
+        'textract': lambda: TEXTRACT.get_document_text_detection(JobId='warmup'),
+        'polly': lambda: POLLY.describe_voices(LanguageCode='en-US')
+    }
+    if S3_BUCKET:
+        warm_up_calls['s3'] = lambda: S3.head_bucket(Bucket=S3_BUCKET)
+    if DYNAMODB:
+        warm_up_calls['dynamodb'] = lambda: DYNAMODB.describe_table(TableName=TEXT_CACHE_TABLE)
+
+    for name in WARM_UP_CLIENTS & warm_up_calls.keys():
+        try:
+            warm_up_calls[name]()
+        except Exception:
+            pass
+
+
+if WARM_UP_CLIENTS:
+    warm_up_clients()
\ No newline at end of file
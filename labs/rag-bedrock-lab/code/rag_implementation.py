@@ -17,17 +17,56 @@ Features:
 """
 
 import boto3
-import json
+import io
+from botocore.config import Config
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import uuid
 
+# orjson is a faster drop-in for request/response marshalling when packaged
+# with the deployment; fall back to the standard library otherwise
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared client configuration: keep pooled connections alive between calls
+# so repeated queries skip the TCP/TLS handshake
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=3,
+    read_timeout=60,
+    max_pool_connections=20
+)
+
+# Concurrent S3 requests used when checking data source prefixes
+PREFIX_CHECK_MAX_WORKERS = 32
+
+# RAG prompt template, filled per query with format_map
+_PROMPT_TEMPLATE = """You are an expert assistant that provides accurate, helpful answers based on the provided context documents.
+
+**Context Documents:**
+{context}
+
+**User Question:** {query}
+
+**Instructions:**
+1. Answer the question based ONLY on the information provided in the context documents
+2. If the context doesn't contain enough information to fully answer the question, clearly state what information is missing
+3. Include specific references to the source documents when possible
+4. Provide a comprehensive but concise answer
+5. If there are conflicting information in the sources, acknowledge this and explain the differences
+
+**Answer:**"""
+
 
 @dataclass
 class QueryResult:
@@ -67,8 +106,8 @@ class RAGProcessor:
         self.region_name = region_name
 
         # Initialize Bedrock clients
-        self.bedrock_agent = boto3.client('bedrock-agent-runtime', region_name=region_name)
-        self.bedrock_runtime = boto3.client('bedrock-runtime', region_name=region_name)
+        self.bedrock_agent = boto3.client('bedrock-agent-runtime', region_name=region_name, config=CLIENT_CONFIG)
+        self.bedrock_runtime = boto3.client('bedrock-runtime', region_name=region_name, config=CLIENT_CONFIG)
 
         logger.info(f"RAG Processor initialized with KB: {knowledge_base_id}")
 
@@ -76,7 +115,8 @@ class RAGProcessor:
         self,
         query: str,
         max_results: int = 5,
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        sub_queries: Optional[List[str]] = None
     ) -> QueryResult:
         """
         Execute end-to-end RAG query with retrieval and generation.
@@ -85,6 +125,8 @@ class RAGProcessor:
             query: Natural language question
             max_results: Maximum number of documents to retrieve
             confidence_threshold: Minimum confidence score for results
+            sub_queries: Optional decomposition of the question; when more
+                than one is given, each is retrieved concurrently
 
         Returns:
             QueryResult object with response and metadata
@@ -95,7 +137,10 @@ class RAGProcessor:
             logger.info(f"Processing query: {query[:100]}...")
 
             # Step 1: Retrieve relevant documents
-            retrieval_results = self._retrieve_documents(query, max_results)
+            if sub_queries and len(sub_queries) > 1:
+                retrieval_results = self._retrieve_multi(sub_queries, max_results)
+            else:
+                retrieval_results = self._retrieve_documents(query, max_results)
 
             # Step 2: Filter by confidence threshold
             filtered_results = [
@@ -131,6 +176,98 @@ class RAGProcessor:
             logger.error(f"Error processing query: {e}")
             raise
 
+    def query_knowledge_base_fast(self, query: str, max_results: int = 5) -> QueryResult:
+        """
+        Execute RAG query with a single retrieve_and_generate round trip.
+
+        Retrieval and generation run server-side, so this saves one Bedrock
+        round trip per query. Use query_knowledge_base when the context needs
+        custom filtering or assembly.
+
+        Args:
+            query: Natural language question
+            max_results: Maximum number of documents to retrieve
+
+        Returns:
+            QueryResult object with response and metadata
+        """
+        start_time = datetime.now()
+
+        try:
+            logger.info(f"Processing query (retrieve_and_generate): {query[:100]}...")
+
+            response = self.bedrock_agent.retrieve_and_generate(
+                input={'text': query},
+                retrieveAndGenerateConfiguration={
+                    'type': 'KNOWLEDGE_BASE',
+                    'knowledgeBaseConfiguration': {
+                        'knowledgeBaseId': self.knowledge_base_id,
+                        'modelArn': f"arn:aws:bedrock:{self.region_name}::foundation-model/{self.model_id}",
+                        'retrievalConfiguration': {
+                            'vectorSearchConfiguration': {
+                                'numberOfResults': max_results,
+                                'overrideSearchType': 'HYBRID'
+                            }
+                        }
+                    }
+                }
+            )
+
+            references = [
+                reference
+                for citation in response.get('citations', [])
+                for reference in citation.get('retrievedReferences', [])
+            ]
+
+            processing_time = (datetime.now() - start_time).total_seconds()
+
+            # retrieve_and_generate does not report relevance scores
+            return QueryResult(
+                query=query,
+                response=response['output']['text'],
+                sources=self._extract_sources(references),
+                confidence_score=0.0,
+                retrieval_count=len(references),
+                processing_time=processing_time
+            )
+
+        except Exception as e:
+            logger.error(f"Error processing query: {e}")
+            raise
+
+    def stream_knowledge_base(
+        self,
+        query: str,
+        max_results: int = 5,
+        confidence_threshold: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Execute RAG query and stream the generated answer as it is produced.
+
+        Args:
+            query: Natural language question
+            max_results: Maximum number of documents to retrieve
+            confidence_threshold: Minimum confidence score for results
+
+        Yields:
+            Text fragments of the generated response
+        """
+        logger.info(f"Streaming query: {query[:100]}...")
+
+        retrieval_results = self._retrieve_documents(query, max_results)
+        filtered_results = [
+            result for result in retrieval_results
+            if result.get('score', 0) >= confidence_threshold
+        ]
+
+        if not filtered_results:
+            logger.warning(f"No results above confidence threshold {confidence_threshold}")
+            yield self._create_fallback_response(query, datetime.now()).response
+            return
+
+        context = self._build_context(filtered_results)
+        yield from self._stream_response(query, context)
+
     def _retrieve_documents(self, query: str, max_results: int) -> List[Dict]:
         """
         Retrieve relevant documents using vector search.
@@ -163,6 +300,38 @@ class RAGProcessor:
             logger.error(f"Document retrieval failed: {e}")
             raise
 
+    def _retrieve_multi(self, sub_queries: List[str], max_results: int) -> List[Dict]:
+        """
+        Retrieve documents for several sub-queries concurrently and merge them.
+
+        Args:
+            sub_queries: Search queries to run in parallel
+            max_results: Maximum documents to retrieve per sub-query and to return
+
+        Returns:
+            The top max_results unique document chunks by descending relevance score
+        """
+        with ThreadPoolExecutor(max_workers=len(sub_queries)) as executor:
+            result_sets = list(executor.map(
+                lambda sub_query: self._retrieve_documents(sub_query, max_results),
+                sub_queries
+            ))
+
+        # The same chunk can match several sub-queries; keep its best score
+        merged: Dict[Tuple[str, str], Dict] = {}
+        for result in (r for results in result_sets for r in results):
+            key = (
+                result.get('location', {}).get('s3Location', {}).get('uri', ''),
+                result['content']['text']
+            )
+            if key not in merged or result.get('score', 0) > merged[key].get('score', 0):
+                merged[key] = result
+
+        results = sorted(merged.values(), key=lambda r: r.get('score', 0), reverse=True)
+        logger.info(f"Merged {len(results)} unique documents from {len(sub_queries)} sub-queries")
+
+        return results[:max_results]
+
     def _build_context(self, retrieval_results: List[Dict]) -> str:
         """
         Build context string from retrieved documents.
@@ -173,27 +342,21 @@ class RAGProcessor:
         Returns:
             Formatted context string for LLM prompt
         """
-        context_chunks = []
+        buffer = io.StringIO()
+        buffer.write("\n" + "=" * 50)
 
         for idx, result in enumerate(retrieval_results, 1):
             # Extract content and metadata
             content = result['content']['text']
             score = result.get('score', 0)
+            source_uri = result.get('location', {}).get('s3Location', {}).get('uri', '')
 
-            # Get source information
-            location = result.get('location', {})
-            source_uri = ""
-            if 's3Location' in location:
-                bucket = location['s3Location'].get('uri', '')
-                source_uri = bucket
-
-            # Format chunk with metadata
-            chunk_header = f"[Document {idx} | Relevance: {score:.2f} | Source: {source_uri}]"
-            context_chunks.append(f"{chunk_header}\n{content}\n")
+            # Write chunk with metadata header straight into the buffer
+            buffer.write(f"\n[Document {idx} | Relevance: {score:.2f} | Source: {source_uri}]\n{content}\n")
 
-        context = "\n" + "="*50 + "\n".join(context_chunks)
+        context = buffer.getvalue()
 
-        logger.info(f"Built context from {len(context_chunks)} chunks ({len(context)} characters)")
+        logger.info(f"Built context from {len(retrieval_results)} chunks ({len(context)} characters)")
         return context
 
     def _generate_response(self, query: str, context: str) -> str:
@@ -207,6 +370,22 @@ class RAGProcessor:
         Returns:
             Generated response text
         """
+        generated_text = "".join(self._stream_response(query, context))
+
+        logger.info(f"Generated response ({len(generated_text)} characters)")
+        return generated_text
+
+    def _stream_response(self, query: str, context: str) -> Iterator[str]:
+        """
+        Stream response text from the foundation model as it is generated.
+
+        Args:
+            query: Original user question
+            context: Retrieved document context
+
+        Yields:
+            Text fragments of the generated response
+        """
         # Create optimized prompt for Claude
         prompt = self._create_rag_prompt(query, context)
 
@@ -225,16 +404,19 @@ class RAGProcessor:
                 ]
             }
 
-            response = self.bedrock_runtime.invoke_model(
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
                 modelId=self.model_id,
-                body=json.dumps(request_body)
+                body=json_dumps(request_body)
             )
 
-            response_body = json.loads(response['body'].read())
-            generated_text = response_body['content'][0]['text']
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
 
-            logger.info(f"Generated response ({len(generated_text)} characters)")
-            return generated_text
+                payload = json_loads(chunk['bytes'])
+                if payload.get('type') == 'content_block_delta':
+                    yield payload['delta'].get('text', '')
 
         except Exception as e:
             logger.error(f"Response generation failed: {e}")
@@ -251,23 +433,7 @@ class RAGProcessor:
         Returns:
             Formatted prompt string
         """
-        prompt = f"""You are an expert assistant that provides accurate, helpful answers based on the provided context documents.
-
-**Context Documents:**
-{context}
-
-**User Question:** {query}
-
-**Instructions:**
-1. Answer the question based ONLY on the information provided in the context documents
-2. If the context doesn't contain enough information to fully answer the question, clearly state what information is missing
-3. Include specific references to the source documents when possible
-4. Provide a comprehensive but concise answer
-5. If there are conflicting information in the sources, acknowledge this and explain the differences
-
-**Answer:**"""
-
-        return prompt
+        return _PROMPT_TEMPLATE.format_map({'context': context, 'query': query})
 
     def _extract_sources(self, retrieval_results: List[Dict]) -> List[str]:
         """
@@ -279,17 +445,12 @@ class RAGProcessor:
         Returns:
             List of source identifiers
         """
-        sources = []
-
-        for result in retrieval_results:
-            location = result.get('location', {})
-
-            if 's3Location' in location:
-                s3_uri = location['s3Location'].get('uri', '')
-                if s3_uri and s3_uri not in sources:
-                    sources.append(s3_uri)
-
-        return sources
+        # dict.fromkeys dedupes in one pass while preserving retrieval order
+        s3_uris = (
+            result.get('location', {}).get('s3Location', {}).get('uri', '')
+            for result in retrieval_results
+        )
+        return list(dict.fromkeys(uri for uri in s3_uris if uri))
 
     def _create_fallback_response(self, query: str, start_time: datetime) -> QueryResult:
         """
@@ -321,8 +482,12 @@ class KnowledgeBaseManager:
 
     def __init__(self, region_name: str = "us-east-1"):
         """Initialize Knowledge Base manager."""
-        self.bedrock_agent = boto3.client('bedrock-agent', region_name=region_name)
-        self.s3_client = boto3.client('s3', region_name=region_name)
+        self.bedrock_agent = boto3.client('bedrock-agent', region_name=region_name, config=CLIENT_CONFIG)
+        self.s3_client = boto3.client(
+            's3',
+            region_name=region_name,
+            config=CLIENT_CONFIG.merge(Config(max_pool_connections=PREFIX_CHECK_MAX_WORKERS))
+        )
 
     def create_knowledge_base(
         self,
@@ -412,6 +577,19 @@ class KnowledgeBaseManager:
             }
 
             if inclusion_prefixes:
+                # Fail fast on prefixes that would ingest nothing; one key per
+                # prefix is enough to prove it is non-empty
+                bucket_name = bucket_arn.split(':::')[-1]
+
+                def has_objects(prefix: str) -> bool:
+                    return self.s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix, MaxKeys=1)['KeyCount'] > 0
+
+                with ThreadPoolExecutor(max_workers=min(PREFIX_CHECK_MAX_WORKERS, len(inclusion_prefixes))) as executor:
+                    found = list(executor.map(has_objects, inclusion_prefixes))
+                empty_prefixes = [prefix for prefix, ok in zip(inclusion_prefixes, found) if not ok]
+                if empty_prefixes:
+                    raise ValueError(f"No documents found under prefixes: {empty_prefixes}")
+
                 data_source_config['dataSourceConfiguration']['s3Configuration']['inclusionPrefixes'] = inclusion_prefixes
 
             response = self.bedrock_agent.create_data_source(**data_source_config)
@@ -470,20 +648,28 @@ def example_rag_usage():
         "Explain the differences between REST and GraphQL APIs"
     ]
 
-    for query in queries:
+    def run_query(query: str) -> Tuple[str, Optional[QueryResult], Optional[Exception]]:
         try:
-            result = rag.query_knowledge_base(query)
-
-            print(f"\n{'='*60}")
-            print(f"Query: {result.query}")
-            print(f"Confidence: {result.confidence_score:.2f}")
-            print(f"Sources: {len(result.sources)}")
-            print(f"Processing Time: {result.processing_time:.2f}s")
-            print(f"\nResponse:\n{result.response}")
-            print(f"\nSources:\n{chr(10).join(result.sources)}")
-
+            return query, rag.query_knowledge_base(query), None
         except Exception as e:
-            print(f"Error processing query '{query}': {e}")
+            return query, None, e
+
+    # Bedrock clients are thread-safe, so independent queries can run concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outcomes = list(executor.map(run_query, queries))
+
+    for query, result, error in outcomes:
+        if error:
+            print(f"Error processing query '{query}': {error}")
+            continue
+
+        print(f"\n{'='*60}")
+        print(f"Query: {result.query}")
+        print(f"Confidence: {result.confidence_score:.2f}")
+        print(f"Sources: {len(result.sources)}")
+        print(f"Processing Time: {result.processing_time:.2f}s")
+        print(f"\nResponse:\n{result.response}")
+        print(f"\nSources:\n{chr(10).join(result.sources)}")
 
 
 if __name__ == "__main__":
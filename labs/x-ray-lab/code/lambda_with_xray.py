@@ -16,21 +16,128 @@ Features:
 - Error tracking and debugging
 """
 
+import codecs
+import itertools
 import json
-import boto3
+import os
+import re
 import time
-import random
 from aws_xray_sdk.core import xray_recorder
-from aws_xray_sdk.core import patch_all
+from aws_xray_sdk.core.utils import stacktrace
 from decimal import Decimal
-from datetime import datetime
 
-# Patch AWS services for automatic X-Ray tracing
-patch_all()
+# Artificial latency and failures are only for demos; they inflate billed
+# duration, so they stay off unless explicitly enabled
+SIMULATE = os.environ.get('XRAY_LAB_SIMULATE') == '1'
+if SIMULATE:
+    import random
+    _rng = random.Random()
 
-# Initialize AWS clients (automatically traced)
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+# Full event payloads can be large and may contain PII; only record them in
+# trace metadata when explicitly debugging
+LOG_FULL_EVENT = os.environ.get('XRAY_LOG_EVENT') == '1'
+
+# File types accepted by handle_file_processing
+_SUPPORTED_FORMATS = ('.txt', '.json', '.csv')
+_ALLOWED_EXTS = frozenset(_SUPPORTED_FORMATS)
+
+# Annotation constraints enforced by put_annotation, mirrored by _put_annotations
+_ANNOTATION_KEY = re.compile(r'[A-Za-z0-9_]+')
+_ANNOTATION_TYPES = (str, int, float, bool)
+
+# Static response headers; X-Trace-Id is added per invocation
+_BASE_HEADERS = {'Content-Type': 'application/json'}
+
+# Simulated business logic steps run by handle_default_request
+_DEFAULT_STEPS = ('validate', 'transform', 'enrich', 'respond')
+_DEFAULT_STEPS_N = len(_DEFAULT_STEPS)
+
+# orjson is a faster drop-in for response serialization when packaged with
+# the deployment; fall back to the standard library otherwise
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
+# AWS clients are created on first use so cold starts only pay for what
+# the request actually touches
+_clients = {}
+_patched = False
+_USERS_TABLE = 'bike-users'  # Example table from X-Ray lab
+
+
+def _client_config():
+    """
+    Build the botocore client configuration that keeps pooled connections
+    alive across warm invocations.
+    """
+    from botocore.config import Config
+    return Config(
+        tcp_keepalive=True,
+        max_pool_connections=10,
+        retries={'max_attempts': 2, 'mode': 'standard'}
+    )
+
+
+def _ensure_patched():
+    """
+    Patch AWS services for automatic X-Ray tracing on first use.
+    """
+    global _patched
+    if not _patched:
+        from aws_xray_sdk.core import patch_all
+        patch_all()
+        _patched = True
+
+
+def _get_dynamodb():
+    """
+    Return the shared low-level DynamoDB client (automatically traced).
+    """
+    if 'dynamodb' not in _clients:
+        _ensure_patched()
+        import boto3
+        _clients['dynamodb'] = boto3.client('dynamodb', config=_client_config())
+    return _clients['dynamodb']
+
+
+def _get_s3():
+    """
+    Return the shared S3 client (automatically traced).
+    """
+    if 's3' not in _clients:
+        _ensure_patched()
+        import boto3
+        _clients['s3'] = boto3.client('s3', config=_client_config())
+    return _clients['s3']
+
+
+def _put_annotations(entity, **annotations):
+    """
+    Add several annotations to a trace entity with one dict update instead
+    of one put_annotation call per key.
+
+    Applies the same checks as put_annotation: entries with keys outside
+    [A-Za-z0-9_] or values that are not strings, numbers or booleans are
+    dropped, and ended entities are left untouched.
+    """
+    if entity.in_progress:
+        entity.annotations.update(
+            (key, value) for key, value in annotations.items()
+            if isinstance(value, _ANNOTATION_TYPES) and _ANNOTATION_KEY.fullmatch(key)
+        )
+
+
+def _iso_now():
+    """
+    Return the current UTC time as an ISO 8601 string with microseconds,
+    without constructing a datetime object.
+    """
+    t = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(t)) + f'.{int((t % 1) * 1e6):06d}Z'
 
 
 @xray_recorder.capture('lambda_handler')
@@ -45,59 +152,69 @@ def lambda_handler(event, context):
     - Error handling with tracing
     """
 
+    # Look the segment up once per invocation and pass the sampling decision
+    # to the request handlers; unsampled traces drop annotations and
+    # metadata, so there is no point building them
+    seg = xray_recorder.current_segment()
+    subsegment = xray_recorder.current_subsegment()
+    sampled = getattr(seg, 'sampled', True)
+    trace_id = seg.trace_id
+    headers = {**_BASE_HEADERS, 'X-Trace-Id': trace_id}
+
+    # Simulate different request types for demonstration
+    request_type = event.get('request_type', 'default')
+
     # Add trace annotations for filtering and search
-    xray_recorder.put_annotation('function_name', context.function_name)
-    xray_recorder.put_annotation('request_id', context.aws_request_id)
+    _put_annotations(
+        subsegment,
+        function_name=context.function_name,
+        request_id=context.aws_request_id,
+        request_type=request_type
+    )
 
     # Add metadata for additional context
-    xray_recorder.put_metadata('event', event)
-    xray_recorder.put_metadata('runtime_info', {
-        'memory_limit': context.memory_limit_in_mb,
-        'remaining_time': context.get_remaining_time_in_millis()
-    })
+    if sampled:
+        if LOG_FULL_EVENT:
+            xray_recorder.put_metadata('event', event)
+        else:
+            xray_recorder.put_metadata('event_summary', {'keys': list(event)})
+        xray_recorder.put_metadata('runtime_info', {
+            'memory_limit': context.memory_limit_in_mb,
+            'remaining_time': context.get_remaining_time_in_millis()
+        })
 
     try:
-        # Simulate different request types for demonstration
-        request_type = event.get('request_type', 'default')
-        xray_recorder.put_annotation('request_type', request_type)
-
-        if request_type == 'database':
-            result = handle_database_request(event)
-        elif request_type == 'file_processing':
-            result = handle_file_processing(event)
-        elif request_type == 'external_api':
-            result = handle_external_api_call(event)
-        else:
-            result = handle_default_request(event)
+        # Event values may be unhashable (lists, objects); route them to the default
+        handler = _DISPATCH.get(request_type, handle_default_request) if isinstance(request_type, str) else handle_default_request
+        result = handler(event, sampled)
 
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'X-Trace-Id': xray_recorder.current_segment().trace_id
-            },
-            'body': json.dumps({
+            'headers': headers,
+            'body': _dumps({
                 'message': 'Request processed successfully',
                 'result': result,
-                'trace_id': xray_recorder.current_segment().trace_id
+                'trace_id': trace_id
             })
         }
 
     except Exception as e:
-        # Add exception to X-Ray trace
-        xray_recorder.current_segment().add_exception(e)
+        # Add exception to X-Ray trace; the Lambda facade segment is
+        # read-only, so record it on this handler's subsegment
+        subsegment.add_exception(e, stacktrace.get_stacktrace(limit=xray_recorder.max_trace_back))
 
         return {
             'statusCode': 500,
-            'body': json.dumps({
-                'error': str(e),
-                'trace_id': xray_recorder.current_segment().trace_id
+            'headers': headers,
+            'body': _dumps({
+                'error': f"{e.__class__.__name__}: {e}",
+                'trace_id': trace_id
             })
         }
 
 
 @xray_recorder.capture('database_operations')
-def handle_database_request(event):
+def handle_database_request(event, sampled=True):
     """
     Handle database operations with detailed X-Ray tracing.
     """
@@ -111,49 +228,53 @@ def handle_database_request(event):
             raise ValueError("Missing user_id parameter")
 
         subsegment.put_annotation('user_id', user_id)
-        subsegment.put_metadata('validation_rules', {
-            'user_id_required': True,
-            'format': 'string'
-        })
+        if sampled:
+            subsegment.put_metadata('validation_rules', {
+                'user_id_required': True,
+                'format': 'string'
+            })
 
     finally:
         xray_recorder.end_subsegment()
 
     # Database operations (automatically traced)
-    table = dynamodb.Table('bike-users')  # Example table from X-Ray lab
+    now_iso = _iso_now()
 
     # Add timing annotation
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     try:
-        # Get user information
-        response = table.get_item(Key={'user_id': user_id})
+        # Upsert the user in a single round trip; login_count comes back as 1
+        # only when the item did not exist before
+        # Values are passed pre-serialized to skip boto3's resource-layer
+        # type marshalling
+        response = _get_dynamodb().update_item(
+            TableName=_USERS_TABLE,
+            Key={'user_id': {'S': user_id}},
+            UpdateExpression='SET last_login = :time, created_at = if_not_exists(created_at, :time) ADD login_count :inc',
+            ExpressionAttributeValues={
+                ':time': {'S': now_iso},
+                ':inc': {'N': '1'}
+            },
+            ReturnValues='UPDATED_NEW'
+        )
+        attributes = response['Attributes']
+        login_count = int(attributes['login_count']['N'])
 
-        if 'Item' not in response:
-            # Create new user record
+        if login_count == 1:
             user_data = {
                 'user_id': user_id,
-                'created_at': datetime.now().isoformat(),
-                'last_login': datetime.now().isoformat(),
-                'login_count': 1
+                'created_at': attributes['created_at']['S'],
+                'last_login': attributes['last_login']['S'],
+                'login_count': login_count
             }
-            table.put_item(Item=user_data)
             result = {'action': 'created', 'user': user_data}
         else:
-            # Update existing user
-            table.update_item(
-                Key={'user_id': user_id},
-                UpdateExpression='SET last_login = :time, login_count = login_count + :inc',
-                ExpressionAttributeValues={
-                    ':time': datetime.now().isoformat(),
-                    ':inc': 1
-                }
-            )
             result = {'action': 'updated', 'user_id': user_id}
 
         # Add performance annotation
-        duration = time.time() - start_time
-        xray_recorder.put_annotation('db_operation_duration', duration)
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        xray_recorder.put_annotation('db_operation_duration_ms', duration_ms)
 
         return result
 
@@ -163,7 +284,7 @@ def handle_database_request(event):
 
 
 @xray_recorder.capture('file_processing')
-def handle_file_processing(event):
+def handle_file_processing(event, sampled=True):
     """
     Handle file processing operations with S3 integration.
     """
@@ -172,38 +293,42 @@ def handle_file_processing(event):
     file_key = event.get('file_key', 'sample.txt')
 
     # Add annotations for filtering
-    xray_recorder.put_annotation('bucket_name', bucket_name)
-    xray_recorder.put_annotation('file_key', file_key)
+    _put_annotations(xray_recorder.current_subsegment(), bucket_name=bucket_name, file_key=file_key)
 
     # Custom subsegment for file validation
     with xray_recorder.in_subsegment('file_validation'):
         # Simulate file validation logic
-        if not file_key.endswith(('.txt', '.json', '.csv')):
+        ext = file_key[file_key.rfind('.'):]
+        if ext not in _ALLOWED_EXTS:
             raise ValueError(f"Unsupported file type: {file_key}")
 
-        xray_recorder.put_metadata('supported_formats', ['.txt', '.json', '.csv'])
+        if sampled:
+            xray_recorder.put_metadata('supported_formats', _SUPPORTED_FORMATS)
 
     try:
         # Get file from S3 (automatically traced)
-        response = s3_client.get_object(Bucket=bucket_name, Key=file_key)
-        file_content = response['Body'].read().decode('utf-8')
+        response = _get_s3().get_object(Bucket=bucket_name, Key=file_key)
 
         # Process file content
-        with xray_recorder.in_subsegment('content_processing'):
+        with xray_recorder.in_subsegment('content_processing') as subsegment:
             # Simulate processing time
-            processing_time = random.uniform(0.1, 0.5)
-            time.sleep(processing_time)
-
-            lines = file_content.split('\n')
-            word_count = sum(len(line.split()) for line in lines)
-
-            xray_recorder.put_annotation('lines_processed', len(lines))
-            xray_recorder.put_annotation('word_count', word_count)
-            xray_recorder.put_annotation('processing_time', processing_time)
+            processing_time = 0.0
+            if SIMULATE:
+                processing_time = 0.1 + 0.4 * _rng.random()
+                time.sleep(processing_time)
+
+            word_count, line_count = _count_words_and_lines(response['Body'])
+
+            _put_annotations(
+                subsegment,
+                lines_processed=line_count,
+                word_count=word_count,
+                processing_time=processing_time
+            )
 
         return {
             'file_key': file_key,
-            'lines': len(lines),
+            'lines': line_count,
             'words': word_count,
             'processing_time': processing_time
         }
@@ -213,8 +338,36 @@ def handle_file_processing(event):
         raise
 
 
+def _count_words_and_lines(body, chunk_size=65536):
+    """
+    Count words and lines in a streamed S3 body without buffering it whole.
+
+    Words split across chunk boundaries are counted once, and multi-byte
+    UTF-8 characters split across chunks are decoded correctly.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    word_count = 0
+    newline_count = 0
+    in_word = False
+
+    for chunk in itertools.chain(body.iter_chunks(chunk_size), [None]):
+        text = decoder.decode(b'', final=True) if chunk is None else decoder.decode(chunk)
+        if not text:
+            continue
+
+        newline_count += text.count('\n')
+        words = len(text.split())
+        # A word straddling the previous chunk boundary was already counted
+        if in_word and not text[0].isspace():
+            words -= 1
+        word_count += words
+        in_word = not text[-1].isspace()
+
+    return word_count, newline_count + 1
+
+
 @xray_recorder.capture('external_api_call')
-def handle_external_api_call(event):
+def handle_external_api_call(event, sampled=True):
     """
     Simulate external API calls with X-Ray tracing.
     """
@@ -225,12 +378,14 @@ def handle_external_api_call(event):
     # Simulate external API call timing
     with xray_recorder.in_subsegment('api_request'):
         # Simulate network latency
-        latency = random.uniform(0.1, 2.0)
-        time.sleep(latency)
+        latency = 0.0
+        if SIMULATE:
+            latency = 0.1 + 1.9 * _rng.random()
+            time.sleep(latency)
 
         # Simulate success/failure
         success_rate = 0.9
-        if random.random() < success_rate:
+        if not SIMULATE or _rng.random() < success_rate:
             # Successful API call
             response_data = {
                 'status': 'success',
@@ -248,7 +403,7 @@ def handle_external_api_call(event):
 
 
 @xray_recorder.capture('default_processing')
-def handle_default_request(event):
+def handle_default_request(event, sampled=True):
     """
     Handle default request type with basic processing.
     """
@@ -258,23 +413,38 @@ def handle_default_request(event):
         # Add custom annotations
         xray_recorder.put_annotation('operation_type', 'default')
 
-        # Simulate processing
-        processing_steps = ['validate', 'transform', 'enrich', 'respond']
+        # Simulate processing; steps are timed inline rather than each
+        # opening its own subsegment
+        step_durations = {}
+        step_start = time.perf_counter()
+
+        for step in _DEFAULT_STEPS:
+            # Simulate step processing time
+            if SIMULATE:
+                time.sleep(0.05 + 0.15 * _rng.random())
 
-        for step in processing_steps:
-            with xray_recorder.in_subsegment(f'step_{step}'):
-                # Simulate step processing time
-                step_time = random.uniform(0.05, 0.2)
-                time.sleep(step_time)
-                xray_recorder.put_annotation(f'{step}_duration', step_time)
+            step_end = time.perf_counter()
+            step_durations[step] = step_end - step_start
+            step_start = step_end
+
+        if sampled:
+            xray_recorder.put_metadata('step_durations', step_durations)
 
     return {
         'message': 'Default processing completed',
-        'steps_completed': len(processing_steps),
-        'timestamp': datetime.now().isoformat()
+        'steps_completed': _DEFAULT_STEPS_N,
+        'timestamp': _iso_now()
     }
 
 
+# Request type to handler mapping; unknown types fall back to the default
+_DISPATCH = {
+    'database': handle_database_request,
+    'file_processing': handle_file_processing,
+    'external_api': handle_external_api_call,
+}
+
+
 # Utility functions for X-Ray debugging
 def get_trace_context():
     """